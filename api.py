@@ -2,30 +2,44 @@
 FastAPI application for scraping Zillow properties
 """
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, HttpUrl
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from supabase import create_client, Client
+from supabase import acreate_client, AsyncClient
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+import aiofiles
+import diskcache
+import httpx
+import asyncio
+import logging
 import os
-import json
+import orjson
 import time
 import re
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from browser_pool import BrowserPool, CHROME_ARGUMENTS, HEADLESS, USER_AGENT
 
 # Load environment variables
 load_dotenv()
 
+# Per-step scrape traces are DEBUG, so they cost nothing unless LOG_LEVEL=DEBUG
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+log = logging.getLogger(__name__)
+
 app = FastAPI(
     title="Zillow Property Scraper API",
     description="API for scraping Zillow property data including images, price, and details",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -41,13 +55,164 @@ app.add_middleware(
 supabase_url = os.getenv("SUPABASE_URL")
 supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
+supabase_client: Optional[AsyncClient] = None
+
 if not supabase_url or not supabase_key:
-    print("⚠️  Warning: Supabase credentials not found in .env file")
-    print("   Data will be saved to JSON files only")
-    supabase_client = None
-else:
-    supabase_client: Client = create_client(supabase_url, supabase_key)
-    print(f"✅ Connected to Supabase: {supabase_url}")
+    log.warning("⚠️  Supabase credentials not found in .env file - data will be saved to JSON files only")
+
+# Rows scraped within FRESHNESS_WINDOW are served from Supabase instead of re-scraped;
+# recent responses are also kept in memory so bursts skip even that lookup
+FRESHNESS_WINDOW = timedelta(hours=1)
+RECENT_CACHE_TTL = 60
+_recent_scrapes = {}
+
+# Optional on-disk cache of scraped listings (URL -> property data) that survives
+# restarts; handy during development, enabled by setting SCRAPE_CACHE_DIR
+SCRAPE_CACHE_DIR = os.getenv("SCRAPE_CACHE_DIR")
+SCRAPE_CACHE_TTL = int(os.getenv("SCRAPE_CACHE_TTL", 24 * 60 * 60))
+scrape_cache = diskcache.Cache(SCRAPE_CACHE_DIR) if SCRAPE_CACHE_DIR else None
+
+# Indented output is for humans; compact JSON is about twice as fast to write
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+if os.getenv("PRETTY_JSON", "0") == "1":
+    JSON_OPTIONS |= orjson.OPT_INDENT_2
+
+# Comma-joined CSS alternatives resolve in one find_element round-trip
+ADDRESS_SELECTOR = ', '.join([
+    'h1',
+    'h1[data-testid="main-header"]',
+    '[data-testid="address"]',
+    '.ds-address-container h1'
+])
+PRICE_SELECTOR = ', '.join([
+    'span[data-testid="price"]',
+    '.ds-price span',
+    'span[class*="price"]',
+    '[data-testid="rent-price"]'
+])
+# XPath union so every "See all photos" variant is matched in one round-trip,
+# including buttons identified only by their text
+SEE_ALL_XPATH = ' | '.join([
+    "//button[@data-testid='gallery-see-all-photos-button']",
+    "//button[@data-testid='see-all-photos']",
+    "//button[contains(@aria-label, 'See all')]",
+    "//button[contains(., 'See all')]"
+])
+GALLERY_SELECTOR = ', '.join([
+    "ul.hollywood-vertical-media-wall-container",
+    "[data-testid='hollywood-vertical-media-wall']",
+    ".StyledVerticalMediaWall-fshdp-8-111-1__sc-1liu0fm-3"
+])
+
+# Embedded JSON in server-rendered listing HTML
+_LD_JSON_RE = re.compile(r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', re.S)
+_NEXT_DATA_RE = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+# Older listing pages ship their query cache in a separate tag, sometimes wrapped in <!-- -->
+_APOLLO_DATA_RE = re.compile(r'<script[^>]*id="hdpApolloPreloadedData"[^>]*>\s*(?:<!--)?(.*?)(?:-->)?\s*</script>', re.S)
+
+# Main property photos are Zillow-hosted cc_ft_ JPEGs; placeholder (-p_e), icon (-p_i),
+# other non-property (-p_c), header (-h_e) and logo images are rejected
+_IMG_ACCEPT = re.compile(r'photos\.zillowstatic\.com.+cc_ft_.+\.jpe?g')
+_IMG_REJECT = re.compile(r'-p_[eic]\.jpg|-h_e\.jpg|zillow_web_logo')
+
+# Patterns for parsing DOM text in the selector fallback
+_PRICE_RE = re.compile(r'\$?([\d,]+)')
+_INT_RE = re.compile(r'(\d+)')
+_FLOAT_RE = re.compile(r'(\d+(?:\.\d+)?)')
+_AREA_RE = re.compile(r'([\d,]+)')
+
+# With BROWSER_FALLBACK=0 no browser is ever launched: listings are scraped from
+# their HTML only, and pages without embedded data fail instead of falling back
+BROWSER_FALLBACK = os.getenv("BROWSER_FALLBACK", "1") != "0"
+
+# Concurrent page fetches per /scrape_batch request
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", 20))
+
+# "selenium" scrapes with the pooled ChromeDriver sessions; "playwright" drives
+# one shared Chromium through async contexts instead
+SCRAPER_BACKEND = os.getenv("SCRAPER_BACKEND", "selenium").lower()
+
+# Warm Chrome drivers shared across requests
+browser_pool = BrowserPool()
+
+
+@app.on_event("startup")
+async def connect_supabase():
+    """Create the async Supabase client on the running event loop"""
+    global supabase_client
+    if supabase_url and supabase_key:
+        supabase_client = await acreate_client(supabase_url, supabase_key)
+
+        # Writes go straight to PostgREST over one long-lived HTTP/2 connection pool
+        app.state.pgrst = httpx.AsyncClient(
+            base_url=f"{supabase_url}/rest/v1",
+            headers={
+                "apikey": supabase_key,
+                "Authorization": f"Bearer {supabase_key}",
+                "Content-Type": "application/json",
+                "Prefer": "return=representation,resolution=merge-duplicates"
+            },
+            http2=True,
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+        log.info("✅ Connected to Supabase: %s", supabase_url)
+
+
+@app.on_event("shutdown")
+async def disconnect_supabase():
+    """Close the PostgREST connection pool"""
+    if supabase_client:
+        await app.state.pgrst.aclose()
+
+
+@app.on_event("startup")
+async def open_http_client():
+    """Open the listing-page HTTP client shared by every request"""
+    app.state.http = new_http_client()
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    """Close the shared listing-page connection pool"""
+    await app.state.http.aclose()
+
+
+@app.on_event("startup")
+async def start_browsers():
+    """Launch the scraping browser(s) and cap concurrent scrapes at the pool size"""
+    app.state.scrape_slots = asyncio.Semaphore(browser_pool.size)
+
+    if not BROWSER_FALLBACK:
+        log.info("ℹ️  Browser fallback disabled - scraping over HTTP only")
+    elif SCRAPER_BACKEND == "playwright":
+        # Imported here so the default Selenium deployment does not need Playwright
+        from playwright.async_api import async_playwright
+        app.state.playwright = await async_playwright().start()
+        app.state.browser = await app.state.playwright.chromium.launch(
+            headless=HEADLESS,
+            executable_path=os.getenv('CHROME_BIN'),
+            args=CHROME_ARGUMENTS
+        )
+        log.info("✅ Playwright Chromium ready")
+    else:
+        # Launching Chrome blocks, so keep it off the event loop
+        await asyncio.to_thread(browser_pool.prewarm)
+        app.state.executor = ThreadPoolExecutor(max_workers=browser_pool.size)
+        log.info("✅ Browser pool ready (%d drivers)", browser_pool.size)
+
+
+@app.on_event("shutdown")
+async def shutdown_browsers():
+    """Stop scrape workers and close every browser"""
+    if not BROWSER_FALLBACK:
+        return
+    if SCRAPER_BACKEND == "playwright":
+        await app.state.browser.close()
+        await app.state.playwright.stop()
+    else:
+        app.state.executor.shutdown(wait=True)
+        browser_pool.shutdown()
 
 
 class ScrapeRequest(BaseModel):
@@ -63,10 +228,10 @@ class ScrapeRequest(BaseModel):
 
 class PropertyData(BaseModel):
     address: Optional[str] = None
-    monthly_rent: Optional[str] = None
-    bedrooms: Optional[str] = None
-    bathrooms: Optional[str] = None
-    area: Optional[str] = None
+    monthly_rent: Optional[float] = None
+    bedrooms: Optional[int] = None
+    bathrooms: Optional[float] = None
+    area: Optional[int] = None
     images: List[str] = []
     url: str
     scraped_at: str
@@ -80,406 +245,602 @@ class ScrapeResponse(BaseModel):
     items_saved: dict
 
 
-class CustomConditions:
-    """Custom wait conditions for Zillow scraper optimization"""
+def wait_for_images_loaded(driver, container=None, timeout=5, min_images=1):
+    """Wait for property images to have their src set, polling inside the browser
 
-    @staticmethod
-    def images_loaded_in_container(container_locator, min_images=5):
-        """Wait for minimum number of images to load in container"""
-        def _predicate(driver):
-            try:
-                container = driver.find_element(*container_locator)
-                images = container.find_elements(By.TAG_NAME, "img")
-                loaded_images = [
-                    img for img in images
-                    if img.get_attribute('src') and
-                    'http' in img.get_attribute('src') and
-                    'placeholder' not in img.get_attribute('src').lower()
-                ]
-                return container if len(loaded_images) >= min_images else False
-            except:
-                return False
-        return _predicate
-
-    @staticmethod
-    def element_has_valid_src(element_locator):
-        """Wait for image element to have valid src attribute"""
-        def _predicate(driver):
-            try:
-                element = driver.find_element(*element_locator)
-                src = element.get_attribute('src')
-                return element if (src and 'http' in src and 'placeholder' not in src.lower()) else False
-            except:
-                return False
-        return _predicate
-
-    @staticmethod
-    def gallery_loaded():
-        """Wait for gallery container to be present and loaded"""
-        gallery_selectors = [
-            "ul.hollywood-vertical-media-wall-container",
-            "[data-testid='hollywood-vertical-media-wall']",
-            ".StyledVerticalMediaWall-fshdp-8-111-1__sc-1liu0fm-3"
-        ]
-
-        def _predicate(driver):
-            for selector in gallery_selectors:
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        return elements[0]
-                except:
-                    continue
-            return False
-        return _predicate
+    Image decoding is disabled in the browser, so an image counts as loaded
+    once its src points at a real photo rather than once its pixels arrive.
+    """
+    script = """
+    const done = arguments[arguments.length - 1];
+    const container = arguments[0] || document;
+    const minImages = arguments[1];
+
+    const check = () => {
+        const propertyImages = Array.from(container.querySelectorAll('img')).filter(img =>
+            img.src &&
+            img.src.includes('photos.zillowstatic.com') &&
+            !img.src.includes('placeholder')
+        );
+        if (propertyImages.length >= minImages && propertyImages.length > 0) return done(true);
+        requestAnimationFrame(check);
+    };
+    check();
+    """
+
+    try:
+        driver.set_script_timeout(timeout)
+        return driver.execute_async_script(script, container, min_images)
+    except Exception as e:
+        return False
 
 
-def wait_for_images_loaded(driver, container=None, timeout=5, min_images=1):
-    """Wait for images to load using JavaScript detection"""
+def wait_for_page_ready(driver, timeout=15, idle_ms=500):
+    """Wait for document.readyState == 'complete', then for the network to go idle
+
+    A client-side redirect or captcha interstitial can unload the document
+    mid-wait; that counts as not ready rather than failing the scrape.
+    """
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+    except WebDriverException:
+        return False
+
+    # Network is idle once no new resource entries have finished for idle_ms
     script = """
-    const container = arguments[0] || document;
-    const images = Array.from(container.querySelectorAll('img'));
+    const done = arguments[arguments.length - 1];
+    const idleMs = arguments[0];
+    let lastCount = performance.getEntriesByType('resource').length;
+    let quietSince = Date.now();
+
+    const check = () => {
+        const count = performance.getEntriesByType('resource').length;
+        if (count !== lastCount) {
+            lastCount = count;
+            quietSince = Date.now();
+        }
+        if (Date.now() - quietSince >= idleMs) return done(true);
+        setTimeout(check, 100);
+    };
+    check();
+    """
 
-    const propertyImages = images.filter(img =>
-        img.src &&
-        img.src.includes('photos.zillowstatic.com') &&
-        !img.src.includes('placeholder')
-    );
+    try:
+        driver.set_script_timeout(timeout)
+        return driver.execute_async_script(script, idle_ms)
+    except WebDriverException:
+        return False
 
-    const loadedImages = propertyImages.filter(img =>
-        img.complete && img.naturalHeight > 0
-    );
 
+# Scrolls each gallery item into view so lazy src attributes get set, waits until the
+# photo count stops growing between two 500 ms polls, then returns the deduplicated
+# property photo URLs in the media wall (null when the wall is missing). Lazy images
+# that only carry data-src are included, and the cc_ft_/exclusion filter runs in-page.
+# Scrolling and polling stop at budgetMs (kept under the caller's script timeout) or
+# on an error, and whatever loaded by then is still returned.
+SCROLL_GALLERY_JS = """async (budgetMs = 45000) => {
+    const wall = document.querySelector('ul.hollywood-vertical-media-wall-container');
+    if (!wall) return null;
+    const deadline = Date.now() + budgetMs;
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+    const photos = () => wall.querySelectorAll("img[src*='photos.zillowstatic.com']");
+
+    try {
+        for (const li of wall.querySelectorAll('li')) {
+            if (Date.now() >= deadline) break;
+            li.scrollIntoView({block: 'center'});
+            await sleep(150);
+        }
+
+        let lastCount = -1;
+        while (photos().length !== lastCount && Date.now() < deadline) {
+            lastCount = photos().length;
+            await sleep(500);
+        }
+    } catch (e) {
+        // Fall through and return the photos collected so far
+    }
+
+    return Array.from(new Set(
+        Array.from(wall.querySelectorAll('img'))
+            .map(img => img.src || img.dataset.src)
+            .filter(url => url &&
+                url.includes('photos.zillowstatic.com') &&
+                /cc_ft_/.test(url) &&
+                !/-p_[eic]\\.jpg|-h_e\\.jpg|zillow_web_logo|placeholder/i.test(url))
+    ));
+}"""
+
+
+def filter_property_images(image_urls: List[str]) -> List[str]:
+    """Keep only unique, high-quality property photos, in page order"""
+    return list(dict.fromkeys(
+        url for url in image_urls
+        if len(url) > 50 and _IMG_ACCEPT.search(url) and not _IMG_REJECT.search(url)
+    ))
+
+
+# Collects JSON-LD blocks and the Next.js hydration payload in a single call
+PAGE_JSON_SCRIPT = """
+const parse = text => { try { return JSON.parse(text); } catch (e) { return null; } };
+const ld = Array.from(document.querySelectorAll('script[type="application/ld+json"]'))
+    .map(el => parse(el.textContent))
+    .filter(Boolean);
+const next = document.getElementById('__NEXT_DATA__');
+const apollo = document.getElementById('hdpApolloPreloadedData');
+return {
+    ld: ld,
+    next: next ? parse(next.textContent) : (window.__NEXT_DATA__ || null),
+    apollo: apollo ? parse(apollo.textContent.replace(/^\\s*<!--|-->\\s*$/g, '')) : null
+};
+"""
+
+DETAILS_SELECTOR = '[data-testid="bed-bath-sqft-fact-container"]'
+
+# Reads every DOM fallback field in one evaluation (CDP Runtime.evaluate under
+# Selenium) instead of a WebDriver command per field
+DOM_FIELDS_SCRIPT = """(() => {
+    const text = selector => {
+        const el = document.querySelector(selector);
+        return el ? el.innerText.trim() : null;
+    };
     return {
-        allLoaded: loadedImages.length >= arguments[1] && loadedImages.length === propertyImages.length,
-        totalImages: propertyImages.length,
-        loadedImages: loadedImages.length
+        address: text(%s),
+        price: text(%s),
+        details: Array.from(document.querySelectorAll(%s)).map(el => el.textContent.trim())
     };
+})()""" % tuple(orjson.dumps(selector).decode() for selector in (ADDRESS_SELECTOR, PRICE_SELECTOR, DETAILS_SELECTOR))
+
+
+def utc_timestamp() -> str:
+    """Current time as an aware UTC ISO string, matching the TIMESTAMPTZ column and freshness cutoff"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _format_address(street, city, state, zipcode) -> Optional[str]:
+    """Join address parts as 'street, city, ST 12345'"""
+    region = ' '.join(part for part in (state, zipcode) if part)
+    parts = [part for part in (street, city, region) if part]
+    return ', '.join(parts) if parts else None
+
+
+def _to_float(value) -> Optional[float]:
+    """Parse a JSON or display number such as 2.5, 90000 or '12,237'"""
+    try:
+        return float(str(value).replace(',', ''))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value) -> Optional[int]:
+    """Parse a whole number, dropping any fractional part"""
+    number = _to_float(value)
+    return int(number) if number is not None else None
+
+
+def _load_json(value):
+    """Decode value if it is a JSON string, passing anything else through"""
+    if isinstance(value, str):
+        try:
+            return orjson.loads(value)
+        except ValueError:
+            return None
+    return value
+
+
+def _find_gdp_property(next_data, apollo_data=None) -> Optional[dict]:
+    """Locate the property record in Zillow's preloaded query cache
+
+    Current pages keep it in __NEXT_DATA__'s gdpClientCache; older ones in
+    hdpApolloPreloadedData.apiCache, which is either nested in __NEXT_DATA__
+    or its own script tag. Caches are JSON strings keyed by query, and several
+    queries may carry a partial record, so they are merged.
     """
+    caches = []
+    apollo_sources = [apollo_data]
+    try:
+        component_props = next_data['props']['pageProps']['componentProps']
+    except (KeyError, TypeError):
+        component_props = None
+    if isinstance(component_props, dict):
+        caches.append(component_props.get('gdpClientCache'))
+        apollo_sources.append(component_props.get('hdpApolloPreloadedData'))
+    for apollo in apollo_sources:
+        apollo = _load_json(apollo)
+        if isinstance(apollo, dict):
+            caches.append(apollo.get('apiCache'))
+
+    properties = []
+    for cache in caches:
+        cache = _load_json(cache)
+        if not isinstance(cache, dict):
+            continue
+        for entry in cache.values():
+            if isinstance(entry, dict) and isinstance(entry.get('property'), dict):
+                properties.append(entry['property'])
+
+    # Stubs such as VariantQuery come before the full record (FullRenderQuery), so
+    # records with photos take precedence and the stubs only fill in missing keys
+    properties.sort(key=lambda prop: not (prop.get('responsivePhotos') or prop.get('photos')))
+    merged = {}
+    for prop in properties:
+        for key, value in prop.items():
+            if merged.get(key) is None:
+                merged[key] = value
+    return merged or None
+
+
+def _iter_ld_items(ld_blocks):
+    """Flatten JSON-LD blocks, including lists and @graph containers"""
+    for block in ld_blocks or []:
+        if isinstance(block, list):
+            items = block
+        elif isinstance(block, dict):
+            items = block.get('@graph', [block])
+        else:
+            continue
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if isinstance(item, dict):
+                yield item
+
+
+def parse_property_json(ld_blocks, next_data, apollo_data=None) -> dict:
+    """Map Zillow's embedded JSON-LD, __NEXT_DATA__ and hdpApolloPreloadedData records onto property_data fields"""
+    data = {}
+
+    for item in _iter_ld_items(ld_blocks):
+        address = item.get('address')
+        if isinstance(address, dict) and 'address' not in data:
+            formatted = _format_address(address.get('streetAddress'), address.get('addressLocality'),
+                                        address.get('addressRegion'), address.get('postalCode'))
+            if formatted:
+                data['address'] = formatted
+
+        offers = item.get('offers')
+        if isinstance(offers, dict) and offers.get('price') is not None:
+            data.setdefault('monthly_rent', _to_float(offers['price']))
+        if item.get('numberOfBedrooms') is not None:
+            data.setdefault('bedrooms', _to_int(item['numberOfBedrooms']))
+        if item.get('numberOfBathroomsTotal') is not None:
+            data.setdefault('bathrooms', _to_float(item['numberOfBathroomsTotal']))
+        floor_size = item.get('floorSize')
+        if isinstance(floor_size, dict) and floor_size.get('value') is not None:
+            data.setdefault('area', _to_int(floor_size['value']))
+
+    # The GraphQL cache is the record the UI renders from, so it wins over JSON-LD
+    prop = _find_gdp_property(next_data, apollo_data)
+    if prop:
+        # Stub records keep the address parts at the top level
+        address = prop.get('address')
+        if not isinstance(address, dict):
+            address = prop
+        formatted = _format_address(address.get('streetAddress'), address.get('city'),
+                                    address.get('state'), address.get('zipcode'))
+        if formatted:
+            data['address'] = formatted
+        if prop.get('price') is not None:
+            data['monthly_rent'] = _to_float(prop['price'])
+        if prop.get('bedrooms') is not None:
+            data['bedrooms'] = _to_int(prop['bedrooms'])
+        if prop.get('bathrooms') is not None:
+            data['bathrooms'] = _to_float(prop['bathrooms'])
+        if prop.get('livingArea') is not None:
+            data['area'] = _to_int(prop['livingArea'])
+
+        # Insertion-ordered dict doubles as an O(1) membership set for deduplication
+        images: Dict[str, None] = {}
+        photos = prop.get('responsivePhotos') or prop.get('photos')
+        for photo in photos if isinstance(photos, list) else []:
+            sources = photo.get('mixedSources') if isinstance(photo, dict) else None
+            jpegs = sources.get('jpeg') if isinstance(sources, dict) else None
+            if isinstance(jpegs, list) and jpegs and isinstance(jpegs[-1], dict) and jpegs[-1].get('url'):
+                images[jpegs[-1]['url']] = None
+        if images:
+            data['images'] = list(images)
+
+    return {key: value for key, value in data.items() if value is not None}
+
+
+DETAIL_KEYS = ('bedrooms', 'bathrooms', 'area')
+
+
+def needs_dom_fields(property_data: dict) -> bool:
+    """Whether any field DOM_FIELDS_SCRIPT can supply is still missing"""
+    return any(key not in property_data for key in ('address', 'monthly_rent') + DETAIL_KEYS)
+
+
+def apply_dom_fields(property_data: dict, dom_fields: dict):
+    """Fill fields still missing from property_data with DOM_FIELDS_SCRIPT's result"""
+    address_text = dom_fields.get('address')
+    if 'address' not in property_data and address_text and len(address_text) > 10:  # Reasonable address length
+        property_data['address'] = address_text
+        log.info("✓ Found address: %s", property_data['address'])
+
+    price_match = _PRICE_RE.search(dom_fields.get('price') or '')
+    if 'monthly_rent' not in property_data and price_match:
+        property_data['monthly_rent'] = _to_float(price_match.group(1))
+        log.info("✓ Found price: $%s", property_data['monthly_rent'])
+
+    bed_bath_items = dom_fields.get('details') or []
+    log.debug("Found %d detail containers: %s", len(bed_bath_items), bed_bath_items)
+    if len(bed_bath_items) < 3:
+        return
+
+    beds_match = _INT_RE.search(bed_bath_items[0])
+    if beds_match and 'bedrooms' not in property_data:
+        property_data['bedrooms'] = int(beds_match.group(1))
+        log.debug("✓ Found bedrooms: %s", property_data['bedrooms'])
+
+    baths_match = _FLOAT_RE.search(bed_bath_items[1])
+    if baths_match and 'bathrooms' not in property_data:
+        property_data['bathrooms'] = float(baths_match.group(1))
+        log.debug("✓ Found bathrooms: %s", property_data['bathrooms'])
+
+    area_match = _AREA_RE.search(bed_bath_items[2])
+    if area_match and 'area' not in property_data:
+        property_data['area'] = _to_int(area_match.group(1))
+        log.debug("✓ Found area: %s sqft", property_data['area'])
+
+
+def new_http_client() -> httpx.AsyncClient:
+    """HTTP/2 client for fetching listing pages, able to hold FETCH_CONCURRENCY connections"""
+    return httpx.AsyncClient(
+        http2=True,
+        headers={
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+        },
+        timeout=15,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=FETCH_CONCURRENCY, max_keepalive_connections=FETCH_CONCURRENCY)
+    )
+
+
+async def scrape_zillow_fast(url: str, client: Optional[httpx.AsyncClient] = None) -> Optional[dict]:
+    """Scrape a Zillow property from its server-rendered HTML without a browser
+
+    Pass a shared client to reuse its connections across several URLs.
+    Returns None when the embedded JSON or its photos are missing (or the
+    request is blocked) so the caller can fall back to a browser scrape.
+    """
+    try:
+        if client is None:
+            async with new_http_client() as own_client:
+                response = await own_client.get(url)
+        else:
+            response = await client.get(url)
+    except httpx.HTTPError as e:
+        log.warning("Fast path request failed: %s", e)
+        return None
+
+    if response.status_code != 200:
+        log.debug("Fast path got HTTP %s", response.status_code)
+        return None
+
+    html = response.text
+    ld_blocks = []
+    for match in _LD_JSON_RE.finditer(html):
+        try:
+            ld_blocks.append(orjson.loads(match.group(1)))
+        except ValueError:
+            continue
+
+    next_data = None
+    next_match = _NEXT_DATA_RE.search(html)
+    if next_match:
+        try:
+            next_data = orjson.loads(next_match.group(1))
+        except ValueError:
+            pass
+
+    apollo_match = _APOLLO_DATA_RE.search(html)
+    apollo_data = _load_json(apollo_match.group(1)) if apollo_match else None
 
     try:
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            result = driver.execute_script(script, container, min_images)
-            if result['allLoaded'] and result['totalImages'] > 0:
-                return True
-            time.sleep(0.3)
-        return False
-    except Exception as e:
-        return False
+        json_fields = parse_property_json(ld_blocks, next_data, apollo_data)
+    except (AttributeError, TypeError, ValueError) as e:
+        log.warning("Fast path could not parse embedded JSON: %s", e)
+        return None
+    if not json_fields.get('images'):
+        log.debug("Fast path found no photos")
+        return None
+
+    log.debug("✓ Fast path found %d fields: %s", len(json_fields), ', '.join(json_fields))
+    return {
+        'url': url,
+        'scraped_at': utc_timestamp(),
+        **json_fields
+    }
 
 
-def scrape_zillow_property(url: str) -> dict:
-    """Scrape a Zillow property using the optimized scraper"""
+async def scrape_zillow_playwright(url: str) -> dict:
+    """Scrape a Zillow property in a fresh context of the shared Playwright browser"""
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    context = await app.state.browser.new_context(
+        user_agent=USER_AGENT,
+        viewport={'width': 1920, 'height': 1080}
+    )
+
+    property_data = {
+        'url': url,
+        'scraped_at': utc_timestamp()
+    }
+
+    try:
+        page = await context.new_page()
+        # Only URLs are needed, so never download media or fonts
+        await page.route("**/*.{png,jpg,jpeg,webp,gif,woff,woff2,mp4}", lambda route: route.abort())
+
+        log.info("Starting scrape for: %s", url)
+        await page.goto(url, wait_until="domcontentloaded")
+        try:
+            await page.wait_for_load_state("networkidle", timeout=15000)
+        except PlaywrightTimeoutError:
+            log.debug("⚠ Page did not settle before timeout, continuing...")
+
+        try:
+            page_json = await page.evaluate(f"() => {{ {PAGE_JSON_SCRIPT} }}")
+            json_fields = parse_property_json(page_json.get('ld'), page_json.get('next'), page_json.get('apollo'))
+            property_data.update(json_fields)
+            log.debug("✓ Found %d fields in embedded JSON: %s", len(json_fields), ', '.join(json_fields))
+        except Exception as e:
+            log.warning("Could not read embedded JSON: %s", e)
+
+        # Fall back to DOM selectors for anything the embedded JSON did not provide
+        if needs_dom_fields(property_data):
+            try:
+                if not all(key in property_data for key in DETAIL_KEYS):
+                    try:
+                        await page.wait_for_selector(DETAILS_SELECTOR, state="attached", timeout=5000)
+                    except PlaywrightTimeoutError:
+                        log.debug("⚠ Timeout waiting for property details, continuing...")
+                apply_dom_fields(property_data, await page.evaluate(DOM_FIELDS_SCRIPT) or {})
+            except Exception as e:
+                log.warning("Could not read DOM fields: %s", e)
+
+        if not property_data.get('images'):
+            try:
+                see_all = page.locator(f"xpath={SEE_ALL_XPATH}").first
+                await see_all.click(timeout=5000)
+                await page.wait_for_selector("ul.hollywood-vertical-media-wall-container", timeout=8000)
+                log.debug("✓ Gallery appeared")
+
+                image_urls = await page.evaluate(SCROLL_GALLERY_JS) or []
+                property_data['images'] = filter_property_images(image_urls)
+                log.info("✓ Found %d filtered property images", len(property_data['images']))
+            except Exception as e:
+                log.warning("Error extracting images: %s", e)
+
+    finally:
+        await context.close()
+
+    return property_data
 
-    # Setup Chrome options
-    options = webdriver.ChromeOptions()
-    # options.add_argument('--headless=new')  # Use new headless mode - DISABLED to see browser
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-    options.add_argument('--disable-blink-features=AutomationControlled')
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
-
-    # Use system chromedriver if available (Docker), otherwise download
-    chromedriver_path = os.getenv('CHROMEDRIVER_PATH')
-    if chromedriver_path and os.path.exists(chromedriver_path):
-        service = Service(chromedriver_path)
-    else:
-        service = Service(ChromeDriverManager().install())
 
-    driver = webdriver.Chrome(service=service, options=options)
+def scrape_zillow_property(url: str) -> dict:
+    """Scrape a Zillow property using the optimized scraper"""
 
-    # Remove webdriver property to avoid detection
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    driver = browser_pool.acquire(timeout=30)
 
     property_data = {
         'url': url,
-        'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        'scraped_at': utc_timestamp()
     }
 
     try:
-        print(f"Starting scrape for: {url}")
+        log.info("Starting scrape for: %s", url)
         driver.get(url)
 
-        # Wait for page to load - increased wait time for Railway
-        print("Waiting for page to load...")
-        time.sleep(8)  # Longer wait for dynamic content in Docker
+        # Wait for the page and its XHR traffic to settle
+        log.debug("Waiting for page to load...")
+        if not wait_for_page_ready(driver, timeout=15):
+            log.debug("⚠ Page did not settle before timeout, continuing...")
 
         # Wait for main content to be present
         try:
             WebDriverWait(driver, 15).until(
                 EC.presence_of_element_located((By.TAG_NAME, "main"))
             )
-            print("✓ Main content loaded")
-        except Exception as e:
-            print(f"⚠ Timeout waiting for main content: {e}, continuing...")
-
-        # Extract address - try multiple selectors
-        try:
-            address_selectors = [
-                'h1',
-                'h1[data-testid="main-header"]',
-                '[data-testid="address"]',
-                '.ds-address-container h1'
-            ]
-            for selector in address_selectors:
-                try:
-                    address_element = driver.find_element(By.CSS_SELECTOR, selector)
-                    address_text = address_element.text.strip()
-                    if address_text and len(address_text) > 10:  # Reasonable address length
-                        property_data['address'] = address_text
-                        print(f"✓ Found address: {property_data['address']}")
-                        break
-                except:
-                    continue
+            log.debug("✓ Main content loaded")
         except Exception as e:
-            print(f"Could not find address: {e}")
+            log.debug("⚠ Timeout waiting for main content: %s, continuing...", e)
 
-        # Extract price - try multiple selectors
+        # Read the listing record Zillow embeds for hydration in one round-trip
         try:
-            price_selectors = [
-                'span[data-testid="price"]',
-                '.ds-price span',
-                'span[class*="price"]',
-                '[data-testid="rent-price"]'
-            ]
-            for selector in price_selectors:
-                try:
-                    price_element = driver.find_element(By.CSS_SELECTOR, selector)
-                    price_text = price_element.text.strip()
-                    price_match = re.search(r'\$?([\d,]+)', price_text)
-                    if price_match:
-                        property_data['monthly_rent'] = price_match.group(1)
-                        print(f"✓ Found price: ${property_data['monthly_rent']}")
-                        break
-                except:
-                    continue
+            page_json = driver.execute_script(PAGE_JSON_SCRIPT)
+            json_fields = parse_property_json(page_json.get('ld'), page_json.get('next'), page_json.get('apollo'))
+            property_data.update(json_fields)
+            log.debug("✓ Found %d fields in embedded JSON: %s", len(json_fields), ', '.join(json_fields))
         except Exception as e:
-            print(f"Could not find price: {e}")
+            log.warning("Could not read embedded JSON: %s", e)
 
-        # Extract property details (beds, baths, area)
-        try:
-            print("Extracting property details...")
-
-            # Wait a bit longer for details to load
-            time.sleep(2)
-
-            details_script = """
-            const containers = Array.from(document.querySelectorAll('[data-testid="bed-bath-sqft-fact-container"]'));
-            return containers.map(el => el.textContent.trim());
-            """
-
-            bed_bath_items = driver.execute_script(details_script)
-
-            print(f"DEBUG: Found {len(bed_bath_items) if bed_bath_items else 0} detail containers: {bed_bath_items}")
-
-            if bed_bath_items and len(bed_bath_items) >= 3:
-                print(f"✓ Found {len(bed_bath_items)} property detail containers")
-
-                # Bedrooms
-                beds_text = bed_bath_items[0]
-                beds_match = re.search(r'(\d+)', beds_text)
-                if beds_match:
-                    property_data['bedrooms'] = beds_match.group(1)
-                    print(f"✓ Found bedrooms: {property_data['bedrooms']}")
-
-                # Bathrooms
-                baths_text = bed_bath_items[1]
-                baths_match = re.search(r'(\d+(?:\.\d+)?)', baths_text)
-                if baths_match:
-                    property_data['bathrooms'] = baths_match.group(1)
-                    print(f"✓ Found bathrooms: {property_data['bathrooms']}")
-
-                # Area
-                area_text = bed_bath_items[2]
-                area_match = re.search(r'([\d,]+)', area_text)
-                if area_match:
-                    property_data['area'] = area_match.group(1) + ' sqft'
-                    print(f"✓ Found area: {property_data['area']}")
-        except Exception as e:
-            print(f"Could not find property details: {e}")
-
-        # Extract images
-        try:
-            print("Looking for 'See all' button...")
-
-            # Extra wait for photo carousel to be ready
-            time.sleep(2)
+        # Fall back to DOM selectors for anything the embedded JSON did not provide
+        if needs_dom_fields(property_data):
+            try:
+                if not all(key in property_data for key in DETAIL_KEYS):
+                    # Wait for details to render
+                    try:
+                        WebDriverWait(driver, 5).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, DETAILS_SELECTOR))
+                        )
+                    except TimeoutException:
+                        log.debug("⚠ Timeout waiting for property details, continuing...")
+
+                log.debug("Extracting DOM fields...")
+                dom_fields = driver.execute_cdp_cmd("Runtime.evaluate", {
+                    "expression": DOM_FIELDS_SCRIPT,
+                    "returnByValue": True
+                })["result"].get("value") or {}
+
+                apply_dom_fields(property_data, dom_fields)
+            except Exception as e:
+                log.warning("Could not read DOM fields: %s", e)
 
-            see_all_selectors = [
-                "button[data-testid='gallery-see-all-photos-button']",
-                "button[data-testid='see-all-photos']",
-                "button[aria-label*='See all']"
-            ]
+        # Open the gallery only when the embedded JSON had no photos
+        if not property_data.get('images'):
+            try:
+                log.debug("Looking for 'See all' button...")
 
-            see_all_clicked = False
-            for selector in see_all_selectors:
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    print(f"DEBUG: Selector '{selector}' found {len(elements)} elements")
-                    if elements:
-                        elements[0].click()
+                see_all_clicked = False
+                buttons = driver.find_elements(By.XPATH, SEE_ALL_XPATH)
+                log.debug("Found %d 'See all' buttons", len(buttons))
+                for button in buttons:
+                    try:
+                        button.click()
                         see_all_clicked = True
-                        print("✓ Clicked 'See all' button")
-                        time.sleep(1.5)  # Longer wait for gallery modal to open
+                        log.debug("✓ Clicked 'See all' button")
 
-                        # Wait for gallery to load
+                        # Wait for gallery to load, keeping the element so the image
+                        # wait below is scoped to it without another lookup
+                        gallery = None
                         try:
-                            WebDriverWait(driver, 8).until(CustomConditions.gallery_loaded())
-                            print("✓ Gallery appeared")
+                            gallery = WebDriverWait(driver, 8).until(EC.visibility_of_element_located((By.CSS_SELECTOR, GALLERY_SELECTOR)))
+                            log.debug("✓ Gallery appeared")
                         except Exception as e:
-                            print(f"Gallery timeout: {e}, continuing...")
+                            log.debug("Gallery timeout: %s, continuing...", e)
 
-                        wait_for_images_loaded(driver, timeout=5, min_images=3)
+                        wait_for_images_loaded(driver, container=gallery, timeout=5, min_images=3)
                         break
-                except Exception as e:
-                    print(f"DEBUG: Error with selector '{selector}': {e}")
-                    continue
+                    except Exception as e:
+                        log.debug("Could not click 'See all' button: %s", e)
+                        continue
 
-            print(f"DEBUG: see_all_clicked = {see_all_clicked}")
+                log.debug("see_all_clicked = %s", see_all_clicked)
 
-            if see_all_clicked:
-                # Comprehensive scrolling strategy to load all images
-                print("Starting comprehensive scrolling strategy...")
-                try:
-                    # Find the media wall container
-                    media_wall_selectors = [
-                        "ul.hollywood-vertical-media-wall-container",
-                        ".StyledVerticalMediaWall-fshdp-8-111-1__sc-1liu0fm-3.bsYjqc.hollywood-vertical-media-wall-container"
-                    ]
-
-                    media_wall = None
-                    for selector in media_wall_selectors:
-                        try:
-                            media_wall = driver.find_element(By.CSS_SELECTOR, selector)
-                            print(f"Found media wall container: {selector}")
-                            break
-                        except:
-                            continue
-
-                    if media_wall:
-                        # Strategy 1: Scroll through each list item individually
-                        print("Strategy 1: Scrolling through each list item...")
-                        list_items = media_wall.find_elements(By.CSS_SELECTOR, "li")
-                        print(f"Found {len(list_items)} list items in media wall")
-
-                        # Scroll to each list item to trigger lazy loading
-                        for i, item in enumerate(list_items):
-                            try:
-                                driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", item)
-                                print(f"Scrolled to list item {i+1}/{len(list_items)}")
-                                time.sleep(0.5)  # Wait for images to load
-                            except:
-                                continue
-
-                        # Strategy 2: Scroll the media wall container with 5 stops
-                        print("Strategy 2: Scrolling media wall container with 5 stops...")
-                        media_wall_height = driver.execute_script("return arguments[0].scrollHeight", media_wall)
-                        scroll_positions = [media_wall_height * 0.2, media_wall_height * 0.4,
-                                          media_wall_height * 0.6, media_wall_height * 0.8,
-                                          media_wall_height]
-
-                        for i, position in enumerate(scroll_positions):
-                            driver.execute_script("arguments[0].scrollTop = arguments[1];", media_wall, int(position))
-                            print(f"Media wall scroll stop {i+1}/5 at {int(position)}px...")
-                            time.sleep(1)
-
-                        # Strategy 3: Final scroll to bottom and back to top
-                        print("Strategy 3: Final scroll to bottom and back to top...")
-                        driver.execute_script("arguments[0].scrollTo(0, arguments[0].scrollHeight);", media_wall)
-                        time.sleep(2)
-                        driver.execute_script("arguments[0].scrollTo(0, 0);", media_wall)
-                        time.sleep(1)
-                    else:
-                        print("Media wall container not found, using fallback scrolling...")
-                        # Fallback: scroll main page
-                        page_height = driver.execute_script("return document.body.scrollHeight")
-                        for i in range(0, 5):
-                            position = page_height * (i + 1) / 5
-                            driver.execute_script(f"window.scrollTo(0, {int(position)});")
-                            time.sleep(1)
+                # Scroll every gallery item into view and collect the URLs in one round-trip
+                log.debug("Scrolling gallery and extracting image URLs...")
+                image_urls = []
 
+                try:
+                    driver.set_script_timeout(60)
+                    image_urls = driver.execute_async_script(
+                        f"const done = arguments[arguments.length - 1]; ({SCROLL_GALLERY_JS})().then(done, () => done(null));"
+                    )
+                    if image_urls is None:
+                        image_urls = []
+                        log.warning("Media wall container not found or gallery script failed!")
+                    log.debug("Total images found before filtering: %d", len(image_urls))
                 except Exception as e:
-                    print(f"Scrolling error: {e}")
+                    log.warning("Error extracting from media wall: %s", e)
 
-            # Extract all image URLs from specific div only
-            print("Extracting image URLs from StyledVerticalMediaWall container...")
-            image_urls = []
+                property_data['images'] = filter_property_images(image_urls)
+                log.info("✓ Found %d filtered property images", len(property_data['images']))
 
-            # Extract images only from the specific media wall container
-            try:
-                # Try multiple selectors for the media wall
-                media_wall_selectors = [
-                    "ul.hollywood-vertical-media-wall-container",
-                    ".StyledVerticalMediaWall-fshdp-8-111-1__sc-1liu0fm-3.bsYjqc.hollywood-vertical-media-wall-container"
-                ]
-
-                media_wall = None
-                for selector in media_wall_selectors:
-                    try:
-                        media_wall = driver.find_element(By.CSS_SELECTOR, selector)
-                        print(f"Found media wall for extraction: {selector}")
-                        break
-                    except:
-                        continue
-
-                if media_wall:
-                    # Get all images within the media wall
-                    media_wall_images = media_wall.find_elements(By.CSS_SELECTOR, "img")
-                    print(f"Found {len(media_wall_images)} images in media wall container")
-
-                    for img in media_wall_images:
-                        src = img.get_attribute('src')
-                        if src and 'http' in src:
-                            image_urls.append(src)
-
-                    # Also check for images in list items
-                    list_items = media_wall.find_elements(By.CSS_SELECTOR, "li")
-                    for li in list_items:
-                        li_images = li.find_elements(By.CSS_SELECTOR, "img")
-                        for img in li_images:
-                            src = img.get_attribute('src')
-                            if src and 'http' in src and src not in image_urls:
-                                image_urls.append(src)
-
-                    print(f"Total images found before filtering: {len(image_urls)}")
-                else:
-                    print("WARNING: Media wall container not found!")
+                # Print first few image URLs for verification
+                for i, img_url in enumerate(property_data['images'][:3]):
+                    log.debug("  Image %d: %s...", i + 1, img_url[:80])
 
             except Exception as e:
-                print(f"Error extracting from media wall: {e}")
-
-            # Filter to get only high-quality property photos
-            unique_images = []
-            for url in image_urls:
-                if (url not in unique_images and
-                    len(url) > 50 and
-                    'photos.zillowstatic.com' in url and  # Only Zillow property photos
-                    ('.jpg' in url or '.jpeg' in url) and  # Only JPG images
-                    'cc_ft_' in url and  # Only main property photos (cc_ft_)
-                    '-p_e.jpg' not in url and  # Exclude placeholder images
-                    '-h_e.jpg' not in url and  # Exclude header images
-                    'zillow_web_logo' not in url and  # Exclude logo images
-                    '-p_i.jpg' not in url and  # Exclude icon images
-                    '-p_c.jpg' not in url):  # Exclude other non-property images
-                    unique_images.append(url)
-
-            property_data['images'] = unique_images
-            print(f"✓ Found {len(property_data['images'])} filtered property images")
-
-            # Print first few image URLs for verification
-            for i, img_url in enumerate(property_data['images'][:3]):
-                print(f"  Image {i+1}: {img_url[:80]}...")
-
-        except Exception as e:
-            print(f"Error extracting images: {e}")
+                log.warning("Error extracting images: %s", e)
 
     finally:
-        driver.quit()
+        browser_pool.release(driver)
 
     return property_data
 
@@ -493,6 +854,7 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "POST /scrape": "Scrape a Zillow property by URL",
+            "POST /scrape_batch": "Scrape several Zillow properties in one request",
             "GET /health": "Health check endpoint"
         }
     }
@@ -505,12 +867,157 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 
+async def read_scrape_cache(url: str) -> Optional[dict]:
+    """Return the disk-cached scrape of url, if the cache is enabled and warm"""
+    if scrape_cache is None:
+        return None
+    # diskcache is blocking SQLite I/O, so keep it off the event loop
+    cached = await asyncio.to_thread(scrape_cache.get, url)
+    if cached is not None:
+        log.info("✓ Disk cache hit for %s", url)
+    return cached
+
+
+def disk_cached_response(property_data: dict) -> ScrapeResponse:
+    """Response for a disk-cache hit, which is neither re-saved nor re-upserted"""
+    return build_scrape_response(
+        property_data, None, None, status="cached",
+        message=f"Property was scraped at {property_data.get('scraped_at')}; returning disk-cached data"
+    )
+
+
+async def scrape_url(url: str, client: Optional[httpx.AsyncClient] = None) -> dict:
+    """Scrape one property live and refresh its disk-cache entry"""
+    # Reuse the app-wide keep-alive connections unless the caller brought its own
+    property_data = await scrape_live(url, client or app.state.http)
+
+    if scrape_cache is not None:
+        await asyncio.to_thread(scrape_cache.set, url, property_data, expire=SCRAPE_CACHE_TTL)
+    return property_data
+
+
+async def scrape_live(url: str, client: Optional[httpx.AsyncClient] = None) -> dict:
+    """Scrape one property, preferring the plain HTTP fetch over a browser"""
+    property_data = await scrape_zillow_fast(url, client)
+    if property_data is not None:
+        return property_data
+
+    if not BROWSER_FALLBACK:
+        raise RuntimeError("No embedded listing data in page HTML and browser fallback is disabled")
+    log.info("Falling back to browser scrape")
+
+    # Excess requests wait here for a free browser
+    async with app.state.scrape_slots:
+        if SCRAPER_BACKEND == "playwright":
+            return await scrape_zillow_playwright(url)
+        # Selenium blocks, so it runs on a worker thread
+        return await asyncio.get_running_loop().run_in_executor(
+            app.state.executor, scrape_zillow_property, url
+        )
+
+
+async def save_to_json(property_data: dict, filename: str):
+    """Write scraped data to a JSON file without blocking the event loop"""
+    async with aiofiles.open(filename, 'wb') as f:
+        await f.write(orjson.dumps(property_data, option=JSON_OPTIONS))
+    log.debug("✅ Data saved to %s", filename)
+
+
+def to_supabase_row(property_data: dict) -> dict:
+    """Map scraped data onto the properties table columns"""
+    return {
+        "address": property_data.get('address'),
+        "monthly_rent": property_data.get('monthly_rent'),
+        "bedrooms": property_data.get('bedrooms'),
+        "bathrooms": property_data.get('bathrooms'),
+        "area": property_data.get('area'),
+        "zillow_url": property_data.get('url'),
+        "images": property_data.get('images', []),
+        "scraped_at": property_data.get('scraped_at')
+    }
+
+
+async def save_to_supabase(properties: List[dict]) -> dict:
+    """Upsert scraped properties in a single request, returning database IDs keyed by URL"""
+    # A conflict target may only appear once per statement, so keep the latest row per URL
+    rows = {p.get('url'): to_supabase_row(p) for p in properties}
+    response = await app.state.pgrst.post(
+        "/properties?on_conflict=zillow_url",
+        content=orjson.dumps(list(rows.values()))
+    )
+    response.raise_for_status()
+    return {row['zillow_url']: row['id'] for row in orjson.loads(response.content)}
+
+
+def build_scrape_response(property_data: dict, database_id: Optional[str], filename: Optional[str],
+                          status: str = "success",
+                          message: str = "Property scraped and saved successfully") -> ScrapeResponse:
+    """Summarize a saved scrape for the API response"""
+    return ScrapeResponse(
+        status=status,
+        message=message,
+        property_id=database_id,
+        zillow_url=property_data.get('url'),
+        items_saved={
+            "address": property_data.get('address'),
+            "monthly_rent": property_data.get('monthly_rent'),
+            "bedrooms": property_data.get('bedrooms'),
+            "bathrooms": property_data.get('bathrooms'),
+            "area": property_data.get('area'),
+            "images_count": len(property_data.get('images', [])),
+            "saved_to_database": database_id is not None,
+            "saved_to_json": filename
+        }
+    )
+
+
+def remember_scrape(url: str, response: ScrapeResponse):
+    """Keep a response in the in-process cache for RECENT_CACHE_TTL seconds"""
+    now = time.monotonic()
+    for cached_url in [u for u, (expires_at, _) in _recent_scrapes.items() if expires_at <= now]:
+        del _recent_scrapes[cached_url]
+    _recent_scrapes[url] = (now + RECENT_CACHE_TTL, response)
+
+
+async def find_fresh_scrape(url: str) -> Optional[ScrapeResponse]:
+    """Return a recent scrape of url from memory or Supabase, if there is one"""
+    cached = _recent_scrapes.get(url)
+    if cached and cached[0] > time.monotonic():
+        return cached[1].model_copy(update={"status": "cached"})
+
+    if not supabase_client:
+        return None
+
+    try:
+        result = await supabase_client.table('properties')\
+            .select('*')\
+            .eq('zillow_url', url)\
+            .gte('scraped_at', (datetime.now(timezone.utc) - FRESHNESS_WINDOW).isoformat())\
+            .limit(1)\
+            .execute()
+    except Exception as e:
+        log.warning("⚠️  Could not check Supabase for a recent scrape: %s", e)
+        return None
+
+    if not result.data:
+        return None
+
+    row = result.data[0]
+    response = build_scrape_response(
+        {**row, 'url': row['zillow_url']}, row['id'], None,
+        status="cached", message=f"Property was scraped at {row['scraped_at']}; returning stored data"
+    )
+    remember_scrape(url, response)
+    return response
+
+
 @app.post("/scrape", response_model=ScrapeResponse)
-async def scrape_property(request: ScrapeRequest):
+async def scrape_property(request: ScrapeRequest, force: bool = False):
     """
     Scrape a Zillow property by URL
 
     - **url**: The full Zillow property URL
+    - **force**: Re-scrape even if the property was scraped within the last hour
 
     Returns the scraped property data including:
     - Address
@@ -526,87 +1033,113 @@ async def scrape_property(request: ScrapeRequest):
     if 'zillow.com' not in request.url:
         raise HTTPException(status_code=400, detail="URL must be a valid Zillow property URL")
 
+    # Serve a recent scrape instead of launching the scraper again
+    if not force:
+        cached = await find_fresh_scrape(request.url)
+        if cached:
+            log.info("✅ Returning cached scrape for %s", request.url)
+            return cached
+
+        # The stored row is already in Supabase, so skip the save step entirely
+        disk_cached = await read_scrape_cache(request.url)
+        if disk_cached is not None:
+            return disk_cached_response(disk_cached)
+
     try:
         # Scrape the property
-        property_data = scrape_zillow_property(request.url)
+        property_data = await scrape_url(request.url)
 
         # Save to JSON file
         filename = f"scraped_property_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w') as f:
-            json.dump(property_data, f, indent=2)
-
-        print(f"✅ Data saved to {filename}")
+        await save_to_json(property_data, filename)
 
         # Save to Supabase if available
         database_id = None
-        database_saved = False
 
         if supabase_client:
             try:
-                # Prepare data for Supabase
-                supabase_data = {
-                    "address": property_data.get('address'),
-                    "monthly_rent": property_data.get('monthly_rent'),
-                    "bedrooms": property_data.get('bedrooms'),
-                    "bathrooms": property_data.get('bathrooms'),
-                    "area": property_data.get('area'),
-                    "zillow_url": property_data.get('url'),
-                    "images": property_data.get('images', []),
-                    "scraped_at": property_data.get('scraped_at')
-                }
-
-                # Check if property already exists
-                existing = supabase_client.table('properties')\
-                    .select('id')\
-                    .eq('zillow_url', property_data.get('url'))\
-                    .execute()
-
-                if existing.data:
-                    # Update existing property
-                    result = supabase_client.table('properties')\
-                        .update(supabase_data)\
-                        .eq('zillow_url', property_data.get('url'))\
-                        .execute()
-                    database_id = existing.data[0]['id']
-                    database_saved = True
-                    print(f"✅ Data updated in Supabase (ID: {database_id})")
-                else:
-                    # Insert new property
-                    result = supabase_client.table('properties')\
-                        .insert(supabase_data)\
-                        .execute()
-                    database_id = result.data[0]['id'] if result.data else None
-                    database_saved = True
-                    print(f"✅ Data saved to Supabase (ID: {database_id})")
-
+                database_id = (await save_to_supabase([property_data])).get(property_data.get('url'))
+                log.info("✅ Data upserted in Supabase (ID: %s)", database_id)
             except Exception as e:
-                print(f"⚠️  Warning: Could not save to Supabase: {e}")
-                database_saved = False
+                log.warning("⚠️  Could not save to Supabase: %s", e)
         else:
-            print("⚠️  Supabase not configured - data only saved to JSON")
+            log.info("⚠️  Supabase not configured - data only saved to JSON")
 
         # Return success response with minimal data
-        return ScrapeResponse(
-            status="success",
-            message="Property scraped and saved successfully",
-            property_id=database_id,
-            zillow_url=property_data.get('url'),
-            items_saved={
-                "address": property_data.get('address'),
-                "monthly_rent": property_data.get('monthly_rent'),
-                "bedrooms": property_data.get('bedrooms'),
-                "bathrooms": property_data.get('bathrooms'),
-                "area": property_data.get('area'),
-                "images_count": len(property_data.get('images', [])),
-                "saved_to_database": database_saved,
-                "saved_to_json": filename
-            }
-        )
+        response = build_scrape_response(property_data, database_id, filename)
+        remember_scrape(request.url, response)
+        return response
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Scraping failed: {str(e)}")
 
 
+@app.post("/scrape_batch", response_model=List[ScrapeResponse])
+async def scrape_properties(requests: List[ScrapeRequest]):
+    """
+    Scrape several Zillow properties concurrently
+
+    Scrapes share the browser pool, and all successful results are saved to
+    Supabase with a single bulk upsert. Failed URLs are reported with an
+    "error" status instead of failing the whole batch.
+    """
+
+    # Validate URLs
+    for request in requests:
+        if 'zillow.com' not in request.url:
+            raise HTTPException(status_code=400, detail=f"URL must be a valid Zillow property URL: {request.url}")
+
+    # Overlap page fetches on one connection pool, at most FETCH_CONCURRENCY at a time;
+    # browser fallbacks are still limited by the pool size inside scrape_url
+    fetch_slots = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def bounded_scrape(url: str) -> tuple:
+        """Return (property_data, from_disk_cache)"""
+        cached = await read_scrape_cache(url)
+        if cached is not None:
+            return cached, True
+        async with fetch_slots:
+            return await scrape_url(url), False
+
+    results = await asyncio.gather(*[bounded_scrape(r.url) for r in requests], return_exceptions=True)
+    # Disk-cache hits were saved when first scraped, so only live scrapes are saved
+    scraped = [result[0] for result in results if not isinstance(result, Exception) and not result[1]]
+
+    # Save each property to its own JSON file
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filenames = {}
+    for i, property_data in enumerate(scraped):
+        filenames[property_data['url']] = f"scraped_property_{timestamp}_{i + 1}.json"
+        await save_to_json(property_data, filenames[property_data['url']])
+
+    # Save to Supabase in one round-trip if available
+    database_ids = {}
+    if supabase_client and scraped:
+        try:
+            database_ids = await save_to_supabase(scraped)
+            log.info("✅ %d properties upserted in Supabase", len(database_ids))
+        except Exception as e:
+            log.warning("⚠️  Could not save to Supabase: %s", e)
+
+    responses = []
+    for request, result in zip(requests, results):
+        if isinstance(result, Exception):
+            responses.append(ScrapeResponse(
+                status="error",
+                message=f"Scraping failed: {str(result)}",
+                zillow_url=request.url,
+                items_saved={}
+            ))
+        elif result[1]:
+            responses.append(disk_cached_response(result[0]))
+        else:
+            property_data = result[0]
+            responses.append(build_scrape_response(
+                property_data, database_ids.get(property_data['url']), filenames[property_data['url']]
+            ))
+    return responses
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
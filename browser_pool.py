@@ -0,0 +1,303 @@
+"""
+Process-wide pool of reusable Chrome WebDriver instances
+"""
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import IO, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # No flock on Windows, so profiles stay throwaway there
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 4))
+MAX_USES_PER_INSTANCE = int(os.getenv("BROWSER_MAX_USES", 50))
+HEADLESS = os.getenv("HEADLESS", "1") != "0"
+# Containers with a small /dev/shm need Chrome to fall back to (slower) /tmp;
+# leave unset when the container runs with --shm-size=2g
+USE_DEV_SHM_DISABLE = os.getenv("USE_DEV_SHM_DISABLE", "0") == "1"
+# Base directory for persistent Chrome profiles so the HTTP and V8 code caches survive
+# restarts; set to an empty string to use throwaway profiles. Each running Chrome
+# holds an flock on its slot, so gunicorn workers and other processes on the host
+# never open the same profile.
+CHROME_PROFILE_DIR = os.path.expanduser(os.getenv("CHROME_PROFILE_DIR", "~/.cache/zillow-scraper-chrome"))
+MAX_PROFILE_SLOTS = 64
+CHROME_DISK_CACHE_SIZE = int(os.getenv("CHROME_DISK_CACHE_SIZE", 100 * 1024 * 1024))
+
+# Site data wiped from the scraped origin between checkouts
+CLEARED_STORAGE_TYPES = "cookies,local_storage,session_storage,indexeddb,websql,service_workers,cache_storage"
+
+# Requests that add page weight without contributing any listing data: media and
+# fonts (only image URLs are scraped) and third-party beacons. Stylesheets are not
+# blocked because gallery lazy loading depends on layout.
+BLOCKED_URLS = [
+    "*.jpg",
+    "*.jpeg",
+    "*.png",
+    "*.webp",
+    "*.gif",
+    "*.woff",
+    "*.woff2",
+    "*.googlesyndication.com*",
+    "*google-analytics.com*",
+    "*.doubleclick.net*",
+]
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+def chromedriver_path() -> Optional[str]:
+    """Use system chromedriver if available (Docker); None lets Selenium Manager resolve a cached one"""
+    path = os.getenv('CHROMEDRIVER_PATH')
+    if path and os.path.exists(path):
+        return path
+    return None
+
+
+# Command-line switches shared by the Selenium pool and the Playwright backend
+CHROME_ARGUMENTS = [
+    '--no-sandbox',
+    '--disable-gpu',
+    '--window-size=1920,1080',
+    '--disable-blink-features=AutomationControlled',
+    # Only image URLs are scraped, so skip downloading and decoding the pixels
+    '--blink-settings=imagesEnabled=false',
+    # Turn off background services that compete for bandwidth
+    '--disable-background-networking',
+    '--disable-sync',
+    '--disable-translate',
+    '--metrics-recording-only',
+    '--disable-features=Translate,BackForwardCache,MediaRouter',
+    '--mute-audio',
+    '--disable-component-update',
+    '--disable-default-apps',
+    # Lean startup: skip first-run work and keep renderers at full speed
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-extensions',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-ipc-flooding-protection',
+    '--disable-hang-monitor',
+    # Room for Zillow's static JS bundles so warm runs skip re-downloading them
+    f'--disk-cache-size={CHROME_DISK_CACHE_SIZE}',
+]
+
+if USE_DEV_SHM_DISABLE:
+    CHROME_ARGUMENTS.append('--disable-dev-shm-usage')
+
+
+def build_chrome_options(profile_dir: Optional[str] = None) -> webdriver.ChromeOptions:
+    """Chrome options shared by every pooled driver"""
+    options = webdriver.ChromeOptions()
+    # driver.get returns on DOMContentLoaded; explicit waits handle the rest
+    options.page_load_strategy = 'eager'
+    if HEADLESS:
+        options.add_argument('--headless=new')
+    for argument in CHROME_ARGUMENTS:
+        options.add_argument(argument)
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    if profile_dir:
+        # A profile can only be open in one Chrome at a time, hence one per slot
+        os.makedirs(profile_dir, exist_ok=True)
+        options.add_argument(f'--user-data-dir={profile_dir}')
+        options.add_argument('--profile-directory=Default')
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+
+    # Stylesheets stay enabled so layout-driven lazy loading keeps working
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.managed_default_content_settings.stylesheets": 0,
+    })
+    return options
+
+
+def create_driver(profile_dir: Optional[str] = None) -> webdriver.Chrome:
+    """Launch a new Chrome instance ready for scraping"""
+    driver = webdriver.Chrome(service=Service(chromedriver_path()), options=build_chrome_options(profile_dir))
+
+    # Remove webdriver property on every document to avoid detection
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+        "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+    })
+
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    return driver
+
+
+class BrowserPool:
+    """Bounded pool of warm Chrome drivers checked out per scrape"""
+
+    def __init__(self, size: int = POOL_SIZE, max_uses: int = MAX_USES_PER_INSTANCE):
+        self.size = size
+        self.max_uses = max_uses
+        self._queue = queue.Queue(maxsize=size)
+        self._uses = {}
+        self._drivers = set()
+        self._created = 0
+        # Lock file held open for each driver's profile slot
+        self._profile_locks = {}
+        self._lock = threading.Lock()
+
+        # Quit Chrome even if the app exits without running its shutdown hooks
+        atexit.register(self.shutdown)
+
+    def prewarm(self):
+        """Start drivers until the pool is full"""
+        while True:
+            with self._lock:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            try:
+                self._queue.put_nowait(self._spawn())
+            except Exception as e:
+                with self._lock:
+                    self._created -= 1
+                log.warning("⚠️  Could not prewarm browser: %s", e)
+                return
+
+    def acquire(self, timeout: float = 30) -> webdriver.Chrome:
+        """Check out a live driver, lazily spawning one if the pool has spare capacity"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                driver = self._queue.get_nowait()
+            except queue.Empty:
+                driver = None
+
+            if driver is None:
+                with self._lock:
+                    can_spawn = self._created < self.size
+                    if can_spawn:
+                        self._created += 1
+
+                if can_spawn:
+                    try:
+                        return self._spawn()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+
+                try:
+                    driver = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    raise TimeoutError(f"No browser available after {timeout}s")
+
+            if self._is_alive(driver):
+                return driver
+            # Chrome died while idle; the next pass spawns a replacement
+            log.warning("⚠️  Idle browser session died, respawning")
+            self._discard(driver)
+
+    def release(self, driver: webdriver.Chrome):
+        """Reset a driver and return it to the pool, recycling worn-out or dead sessions"""
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+
+        if uses >= self.max_uses:
+            self._discard(driver)
+            return
+
+        try:
+            origin = driver.execute_script("window.stop(); return location.origin;")
+            # Cookies from every domain plus the listing site's storage, so the
+            # next scrape starts clean even when the profile lives on disk
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            if origin and origin != "null":
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": origin,
+                    "storageTypes": CLEARED_STORAGE_TYPES
+                })
+            driver.get("about:blank")
+        except WebDriverException as e:
+            log.warning("⚠️  Browser session lost, discarding: %s", e)
+            self._discard(driver)
+            return
+
+        self._queue.put_nowait(driver)
+
+    def shutdown(self):
+        """Quit every driver, including any still checked out"""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            drivers = list(self._drivers)
+        for driver in drivers:
+            self._discard(driver)
+
+    @staticmethod
+    def _claim_profile() -> Tuple[Optional[str], Optional[IO]]:
+        """Lock the first profile slot no other Chrome on this host is using"""
+        if not CHROME_PROFILE_DIR or fcntl is None:
+            return None, None
+        os.makedirs(CHROME_PROFILE_DIR, exist_ok=True)
+        for slot in range(MAX_PROFILE_SLOTS):
+            lock_file = open(os.path.join(CHROME_PROFILE_DIR, f"slot-{slot}.lock"), "w")
+            try:
+                # The kernel drops the lock if this process dies, so stale slots free themselves
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                continue
+            return os.path.join(CHROME_PROFILE_DIR, f"slot-{slot}"), lock_file
+        log.warning("⚠️  All %d Chrome profile slots are in use, using a throwaway profile", MAX_PROFILE_SLOTS)
+        return None, None
+
+    @staticmethod
+    def _is_alive(driver: webdriver.Chrome) -> bool:
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _spawn(self) -> webdriver.Chrome:
+        profile_dir, lock_file = self._claim_profile()
+        try:
+            driver = create_driver(profile_dir)
+        except Exception:
+            if lock_file:
+                lock_file.close()
+            raise
+
+        with self._lock:
+            self._uses[id(driver)] = 0
+            self._profile_locks[id(driver)] = lock_file
+            self._drivers.add(driver)
+        return driver
+
+    def _discard(self, driver: webdriver.Chrome):
+        # Replacement is spawned lazily by the next acquire()
+        with self._lock:
+            if driver not in self._drivers:
+                return
+            self._drivers.discard(driver)
+            self._uses.pop(id(driver), None)
+            lock_file = self._profile_locks.pop(id(driver), None)
+            self._created -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        # Only hand the profile on once this Chrome has released it
+        if lock_file:
+            lock_file.close()
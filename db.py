@@ -0,0 +1,55 @@
+"""
+Shared PostgreSQL connection pool
+"""
+import os
+import threading
+from contextlib import contextmanager
+from psycopg2.pool import ThreadedConnectionPool
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Long-lived pooled connections belong on the session pooler / direct port (5432);
+# one-off scripts can point at Supabase's transaction pooler (6543) instead
+POSTGRES_URL = os.getenv("POSTGRES_URL_NON_POOLING")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ThreadedConnectionPool:
+    """Create the process-wide pool on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if not POSTGRES_URL:
+                raise RuntimeError("POSTGRES_URL_NON_POOLING not found in .env")
+            _pool = ThreadedConnectionPool(
+                minconn=2,
+                maxconn=8,
+                dsn=POSTGRES_URL,
+                keepalives=1,
+                keepalives_idle=30
+            )
+        return _pool
+
+
+@contextmanager
+def get_connection():
+    """Borrow a pooled connection; commits on success, rolls back on error"""
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        with conn:
+            yield conn
+    finally:
+        pool.putconn(conn)
+
+
+def close_pool():
+    """Close every pooled connection"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
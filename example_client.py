@@ -2,7 +2,7 @@
 Simple example client for the Zillow Scraper API
 """
 import requests
-import json
+import orjson
 import sys
 
 API_URL = "http://localhost:8000"
@@ -55,19 +55,21 @@ def display_property(data: dict):
     print("=" * 70)
     print("PROPERTY DETAILS")
     print("=" * 70)
+    rent = data.get('monthly_rent')
+    area = data.get('area')
     print(f"Address:       {data.get('address', 'N/A')}")
-    print(f"Monthly Rent:  ${data.get('monthly_rent', 'N/A')}")
+    print(f"Monthly Rent:  {f'${rent}' if rent is not None else 'N/A'}")
     print(f"Bedrooms:      {data.get('bedrooms', 'N/A')}")
     print(f"Bathrooms:     {data.get('bathrooms', 'N/A')}")
-    print(f"Area:          {data.get('area', 'N/A')}")
+    print(f"Area:          {f'{area} sqft' if area is not None else 'N/A'}")
     print(f"Images Found:  {len(data.get('images', []))}")
     print(f"Scraped At:    {data.get('scraped_at', 'N/A')}")
     print("=" * 70)
 
     # Save to file
     filename = f"property_{data.get('address', 'unknown').replace(' ', '_').replace(',', '')}.json"
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     print(f"✅ Data saved to: {filename}")
 
 
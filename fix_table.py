@@ -1,77 +1,72 @@
 """
 Fix the properties table in Supabase by dropping and recreating it
 """
-import os
-import psycopg2
-from dotenv import load_dotenv
-
-load_dotenv()
+from db import POSTGRES_URL, get_connection, close_pool
 
 def fix_table():
     """Drop and recreate the properties table with correct schema"""
 
-    postgres_url = os.getenv("POSTGRES_URL_NON_POOLING")
-
-    if not postgres_url:
+    if not POSTGRES_URL:
         print("❌ Error: POSTGRES_URL_NON_POOLING not found in .env")
         return False
 
     try:
-        conn = psycopg2.connect(postgres_url)
-        cursor = conn.cursor()
-
-        print("Dropping existing properties table...")
-        cursor.execute("DROP TABLE IF EXISTS properties CASCADE;")
-        conn.commit()
-        print("✅ Table dropped")
-
-        print("\nCreating new properties table...")
-
-        # Create table
-        cursor.execute("""
-            CREATE TABLE properties (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                address TEXT,
-                monthly_rent TEXT,
-                bedrooms TEXT,
-                bathrooms TEXT,
-                area TEXT,
-                zillow_url TEXT NOT NULL,
-                images JSONB DEFAULT '[]'::jsonb,
-                scraped_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                UNIQUE(zillow_url)
-            );
-        """)
-        conn.commit()
-        print("✅ Table created")
-
-        # Create indexes
-        print("\nCreating indexes...")
-        cursor.execute("CREATE INDEX idx_properties_zillow_url ON properties(zillow_url);")
-        cursor.execute("CREATE INDEX idx_properties_address ON properties(address);")
-        cursor.execute("CREATE INDEX idx_properties_scraped_at ON properties(scraped_at DESC);")
-        conn.commit()
-        print("✅ Indexes created")
-
-        # Enable RLS
-        print("\nEnabling Row Level Security...")
-        cursor.execute("ALTER TABLE properties ENABLE ROW LEVEL SECURITY;")
-        conn.commit()
-
-        # Create policy
-        cursor.execute("""
-            CREATE POLICY "Enable all operations for all users" ON properties
-            FOR ALL
-            USING (true)
-            WITH CHECK (true);
-        """)
-        conn.commit()
-        print("✅ RLS enabled with policy")
-
-        cursor.close()
-        conn.close()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+
+            print("Dropping existing properties table...")
+            cursor.execute("DROP TABLE IF EXISTS properties CASCADE;")
+            conn.commit()
+            print("✅ Table dropped")
+
+            print("\nCreating new properties table...")
+
+            # Create table
+            cursor.execute("""
+                CREATE TABLE properties (
+                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                    address TEXT,
+                    monthly_rent NUMERIC(10,2),
+                    bedrooms SMALLINT,
+                    bathrooms NUMERIC(3,1),
+                    area INTEGER,
+                    zillow_url TEXT NOT NULL,
+                    images JSONB DEFAULT '[]'::jsonb,
+                    scraped_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                    UNIQUE(zillow_url)
+                );
+            """)
+            conn.commit()
+            print("✅ Table created")
+
+            # Create indexes
+            print("\nCreating indexes...")
+            # zillow_url needs no extra index: UNIQUE(zillow_url) already creates one
+            cursor.execute("CREATE INDEX idx_properties_address ON properties(address);")
+            cursor.execute("CREATE INDEX idx_properties_images_gin ON properties USING GIN (images jsonb_path_ops);")
+            cursor.execute("CREATE INDEX idx_properties_rent_beds ON properties(bedrooms, monthly_rent);")
+            cursor.execute("CREATE INDEX idx_properties_scraped_at ON properties(scraped_at DESC);")
+            conn.commit()
+            print("✅ Indexes created")
+
+            # Enable RLS
+            print("\nEnabling Row Level Security...")
+            cursor.execute("ALTER TABLE properties ENABLE ROW LEVEL SECURITY;")
+            conn.commit()
+
+            # Create policy
+            cursor.execute("""
+                CREATE POLICY "Enable all operations for all users" ON properties
+                FOR ALL
+                USING (true)
+                WITH CHECK (true);
+            """)
+            conn.commit()
+            print("✅ RLS enabled with policy")
+
+            cursor.close()
 
         print("\n✅ Table fixed successfully!")
         return True
@@ -80,6 +75,9 @@ def fix_table():
         print(f"❌ Error: {e}")
         return False
 
+    finally:
+        close_pool()
+
 
 if __name__ == "__main__":
     print("=" * 70)